@@ -7,11 +7,188 @@ import os
 import subprocess
 import time
 import re
+import codecs
+import itertools
+import bisect
+import threading
+import socket
+import ipaddress
+import concurrent.futures
+from collections import defaultdict
 from urllib.parse import unquote
 
+MAX_SUBSCRIPTION_BYTES = 16 * 1024 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+DUMMY_SERVERS = frozenset(["127.0.0.1", "8.8.8.8", "0.0.0.0"])
+DNS_CACHE_TTL = 300
+DNS_FAILURE_TTL = 30
+DNS_RESOLVE_WORKERS = 16
+
+_B64_URLSAFE_TABLE = str.maketrans("-_", "+/")
+_B64_JUNK_RE = re.compile(r'[^A-Za-z0-9+/]')
+_B64_PREFIX_RE = re.compile(r'[A-Za-z0-9+/=_-]*')
+_LINK_SCHEME_RE = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://')
+_META_NAME_RE = re.compile(r'اسم:\s*(.*)$')
+_META_DATA_RE = re.compile(r'حجم باقی مانده:\s*(.*)$')
+_META_EXPIRE_RE = re.compile(r'زمان باقی مانده:\s*(.*)$')
+_DATA_PATTERNS = [
+    (re.compile(r'(\d+(?:\.\d+)?)\s*(?:ترابایت|TB|tb)'), "TB"),
+    (re.compile(r'(\d+(?:\.\d+)?)\s*(?:گیگابایت|GB|gb)'), "GB"),
+    (re.compile(r'(\d+(?:\.\d+)?)\s*(?:مگابایت|MB|mb)'), "MB"),
+]
+_TIME_PATTERNS = [
+    (re.compile(r'(\d+)\s*(?:روز|Day|days)'), "d"),
+    (re.compile(r'(\d+)\s*(?:ساعت|Hour|hours)'), "h"),
+    (re.compile(r'(\d+)\s*(?:دقیقه|Minute|minutes)'), "m"),
+]
+
+_TOKEN_RE = re.compile(r'\w+')
+_FLAG_RE = re.compile(r'[\U0001F1E6-\U0001F1FF]{2}')
+_PERSIAN_FOLD_TABLE = str.maketrans({"ي": "ی", "ى": "ی", "ك": "ک", "ة": "ه", "\u200c": " "})
+_FILTER_ALIASES = {"proto": "protocol", "protocol": "protocol", "net": "transport", "type": "transport", "transport": "transport",
+                   "sec": "security", "security": "security", "host": "host", "sub": "sub"}
+
+class ServerIndex:
+    # In-memory lookup over every parsed config of every subscription. Entries
+    # are keyed by the identity of the config dict held in subscriptions.
+    def __init__(self):
+        self.entries = {}
+        self.sub_keys = defaultdict(set)
+        self.tokens = defaultdict(set)
+        self.fields = {"protocol": defaultdict(set), "transport": defaultdict(set), "security": defaultdict(set), "host": defaultdict(set), "sub": defaultdict(set)}
+        self.sorted_tokens = []
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def _tokenize(self, text: str) -> set:
+        text = str(text).lower().translate(_PERSIAN_FOLD_TABLE)
+        found = set(_TOKEN_RE.findall(text))
+        for flag in _FLAG_RE.findall(text):
+            found.add("".join(chr(ord(c) - 0x1F1E6 + ord("a")) for c in flag))
+        return found
+
+    def _describe(self, url: str, sub_name: str, config: dict) -> dict:
+        details = config.get("details", {})
+        if not isinstance(details, dict): details = {}
+        if config.get("protocol") == "vmess":
+            transport, security = details.get("net", "tcp"), details.get("tls", "none")
+            hosts = [details.get("add", ""), details.get("host", ""), details.get("sni", "")]
+        else:
+            transport, security = details.get("type", "tcp"), details.get("security", "none")
+            hosts = [details.get("server", ""), details.get("host", ""), details.get("sni", "")]
+        hosts = {str(h).lower() for h in hosts if h}
+        protocol = str(config.get("protocol", "unknown")).lower()
+        transport = str(transport or "tcp").lower()
+        security = str(security or "none").lower()
+        return {
+            "url": url,
+            "config": config,
+            "remark": str(config.get("remark", "")),
+            "tokens": self._tokenize(config.get("remark", "")) | self._tokenize(sub_name) | {label for h in hosts for label in self._tokenize(h)} | {protocol, transport, security},
+            "protocol": {protocol},
+            "transport": {transport},
+            "security": {security},
+            "host": hosts,
+            "sub": self._tokenize(sub_name),
+            "latency": config.get("ping"),
+        }
+
+    def _add(self, url: str, sub_name: str, config: dict):
+        key = id(config)
+        entry = self._describe(url, sub_name, config)
+        self.entries[key] = entry
+        self.sub_keys[url].add(key)
+        for token in entry["tokens"] | entry["host"]: self.tokens[token].add(key)
+        for field, values in self.fields.items():
+            for value in entry[field]: values[value].add(key)
+        self.dirty = True
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None: return
+        sub_keys = self.sub_keys.get(entry["url"])
+        if sub_keys is not None:
+            sub_keys.discard(key)
+            if not sub_keys: del self.sub_keys[entry["url"]]
+        for token in entry["tokens"] | entry["host"]:
+            self.tokens[token].discard(key)
+            if not self.tokens[token]: del self.tokens[token]
+        for field, values in self.fields.items():
+            for value in entry[field]:
+                values[value].discard(key)
+                if not values[value]: del values[value]
+        self.dirty = True
+
+    def add_subscription(self, url: str, sub_data: dict):
+        with self.lock:
+            for key in list(self.sub_keys.pop(url, ())): self._remove(key)
+            for config in sub_data.get("configs", []): self._add(url, sub_data.get("name", ""), config)
+
+    def remove_subscription(self, url: str):
+        with self.lock:
+            for key in list(self.sub_keys.pop(url, ())): self._remove(key)
+
+    def remove_config(self, config: dict):
+        with self.lock: self._remove(id(config))
+
+    def update_latency(self, config: dict):
+        with self.lock:
+            entry = self.entries.get(id(config))
+            if entry is not None: entry["latency"] = config.get("ping")
+
+    def _prefix_matches(self, prefix: str) -> set:
+        if self.dirty:
+            self.sorted_tokens = sorted(self.tokens)
+            self.dirty = False
+        matches = set()
+        i = bisect.bisect_left(self.sorted_tokens, prefix)
+        while i < len(self.sorted_tokens) and self.sorted_tokens[i].startswith(prefix):
+            matches |= self.tokens[self.sorted_tokens[i]]
+            i += 1
+        return matches
+
+    def search(self, query: str, sort: str = "latency", limit: int = None) -> list:
+        # Plain words are prefix-matched against remark, subscription name and
+        # host tokens; "field:value" terms (proto, net, sec, host, sub) filter exactly.
+        with self.lock:
+            result = None
+            for term in query.split():
+                field, _, value = term.partition(":")
+                if value and field.lower() in _FILTER_ALIASES:
+                    field = _FILTER_ALIASES[field.lower()]
+                    if field in ("host", "sub"):
+                        keys = set()
+                        for word in self._tokenize(value) if field == "sub" else [value.lower()]:
+                            keys |= {k for h, ks in self.fields[field].items() if h.startswith(word) for k in ks}
+                    else:
+                        keys = set(self.fields[field].get(value.lower(), ()))
+                else:
+                    words = self._tokenize(term)
+                    keys = None
+                    for word in words:
+                        matched = self._prefix_matches(word)
+                        keys = matched if keys is None else keys & matched
+                    if keys is None: continue
+                result = keys if result is None else result & keys
+                if not result: return []
+            if result is None: result = set(self.entries)
+            entries = [self.entries[k] for k in result]
+        if sort == "latency":
+            entries.sort(key=lambda e: (e["latency"] is None or e["latency"] < 0, max(e["latency"] or 0, 0), e["remark"]))
+        elif sort == "remark":
+            entries.sort(key=lambda e: e["remark"])
+        if limit is not None: entries = entries[:limit]
+        return [(e["url"], e["config"]) for e in entries]
+
 class V2RayCoreManager:
     def __init__(self):
         self.subscriptions = {} 
+        self.index = ServerIndex()
+        self.dns_cache = {}
+        self.dns_lock = threading.Lock()
+        self.dns_ttl = DNS_CACHE_TTL
+        self.dns_failure_ttl = DNS_FAILURE_TTL
+        self.pin_resolved_ips = False
         self.data_file = "subscriptions.json"
         self.xray_process = None
         self.config_path = "xray_temp_config.json"
@@ -30,6 +207,7 @@ class V2RayCoreManager:
                             self.subscriptions[k] = v
             except json.JSONDecodeError:
                 self.subscriptions = {}
+        for url, sub_data in self.subscriptions.items(): self.index.add_subscription(url, sub_data)
 
     def save_configs(self):
         with open(self.data_file, 'w', encoding='utf-8') as f:
@@ -37,21 +215,11 @@ class V2RayCoreManager:
 
     def _format_persian_metrics(self, text: str, metric_type: str) -> str:
         if not text: return "N/A"
+        patterns = _DATA_PATTERNS if metric_type == "data" else _TIME_PATTERNS if metric_type == "time" else []
         parts = []
-        if metric_type == "data":
-            tb = re.search(r'(\d+(?:\.\d+)?)\s*(?:ترابایت|TB|tb)', text)
-            gb = re.search(r'(\d+(?:\.\d+)?)\s*(?:گیگابایت|GB|gb)', text)
-            mb = re.search(r'(\d+(?:\.\d+)?)\s*(?:مگابایت|MB|mb)', text)
-            if tb: parts.append(f"{tb.group(1)}TB")
-            if gb: parts.append(f"{gb.group(1)}GB")
-            if mb: parts.append(f"{mb.group(1)}MB")
-        elif metric_type == "time":
-            d = re.search(r'(\d+)\s*(?:روز|Day|days)', text)
-            h = re.search(r'(\d+)\s*(?:ساعت|Hour|hours)', text)
-            m = re.search(r'(\d+)\s*(?:دقیقه|Minute|minutes)', text)
-            if d: parts.append(f"{d.group(1)}d")
-            if h: parts.append(f"{h.group(1)}h")
-            if m: parts.append(f"{m.group(1)}m")
+        for pattern, unit in patterns:
+            match = pattern.search(text)
+            if match: parts.append(f"{match.group(1)}{unit}")
         return ", ".join(parts) if parts else text
 
     def parse_config(self, raw_link: str) -> dict:
@@ -85,73 +253,222 @@ class V2RayCoreManager:
             parsed_data["remark"] = "Parse Error"
         return parsed_data
 
-    def fetch_subscription(self, url: str):
+    def _iter_body_chunks(self, response, max_bytes: int = MAX_SUBSCRIPTION_BYTES):
+        declared = response.headers.get("Content-Length", "")
+        if declared.isdigit() and int(declared) > max_bytes:
+            raise ValueError(f"Subscription body too large ({declared} bytes)")
+        received = 0
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if not chunk: continue
+            received += len(chunk)
+            if received > max_bytes: raise ValueError(f"Subscription body exceeds {max_bytes} bytes")
+            yield chunk
+
+    def _is_plain_body(self, head: str, final: bool):
+        # Decided on the first non-blank, non-comment line: link lists contain
+        # characters outside the base64 alphabet (the scheme's ":") within the
+        # first few bytes, base64 bodies never do. None means "need more bytes".
+        lines = head.split("\n")
+        for i, line in enumerate(lines):
+            complete = final or i < len(lines) - 1
+            line = line.strip()
+            if not line: continue
+            if line.startswith("#"):
+                if complete: continue
+                return None
+            if _B64_PREFIX_RE.match(line).end() < len(line): return True
+            if complete or len(line) >= 16: return False
+            return None
+        return False if final else None
+
+    def _iter_decoded_text(self, chunks):
+        chunks = iter(chunks)
+        head = b""
+        plain = None
+        for chunk in chunks:
+            head += chunk
+            plain = self._is_plain_body(head.decode("utf-8", "ignore"), final=False)
+            if plain is not None: break
+        if plain is None: plain = self._is_plain_body(head.decode("utf-8", "ignore"), final=True)
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        if plain:
+            for chunk in itertools.chain([head], chunks):
+                yield utf8.decode(chunk)
+            yield utf8.decode(b"", final=True)
+            return
+        pending = ""
+        for chunk in itertools.chain([head], chunks):
+            pending += _B64_JUNK_RE.sub("", chunk.decode("ascii", "ignore").translate(_B64_URLSAFE_TABLE))
+            cut = len(pending) - len(pending) % 4
+            if cut:
+                yield utf8.decode(base64.b64decode(pending[:cut]))
+                pending = pending[cut:]
+        pending += '=' * ((4 - len(pending) % 4) % 4)
+        yield utf8.decode(base64.b64decode(pending), final=True)
+
+    def _iter_lines(self, text_chunks):
+        tail = ""
+        for text in text_chunks:
+            lines = (tail + text).split("\n")
+            tail = lines.pop()
+            for line in lines:
+                line = line.strip()
+                if line and not line.startswith("#"): yield line
+        tail = tail.strip()
+        if tail and not tail.startswith("#"): yield tail
+
+    def _iter_real_configs(self, parsed_configs, meta: dict):
+        # meta["lines"]/meta["links"] let the caller tell an empty subscription
+        # from a body that is not a subscription at all (HTML or JSON error pages).
+        for config in parsed_configs:
+            meta["lines"] = meta.get("lines", 0) + 1
+            if not _LINK_SCHEME_RE.match(config.get("raw", "")): continue
+            meta["links"] = meta.get("links", 0) + 1
+            remark = config.get("remark", "")
+            match = _META_NAME_RE.search(remark)
+            if match:
+                meta["name"] = match.group(1).strip()
+                continue
+            match = _META_DATA_RE.search(remark)
+            if match:
+                meta["data_str"] = self._format_persian_metrics(match.group(1).strip(), "data")
+                continue
+            match = _META_EXPIRE_RE.search(remark)
+            if match:
+                meta["expire_str"] = self._format_persian_metrics(match.group(1).strip(), "time")
+                continue
+            if config.get("details", {}).get("server", "") in DUMMY_SERVERS: continue
+            yield config
+
+    def fetch_subscription(self, url: str, on_config=None):
         try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            sub_name = "Subscription"
-            if "profile-title" in response.headers:
-                sub_name = unquote(response.headers["profile-title"])
-            elif "Content-Disposition" in response.headers:
-                disp = response.headers["Content-Disposition"]
-                if "filename=" in disp:
-                    sub_name = disp.split("filename=")[1].strip('"\'')
-            sub_info = {}
-            if "subscription-userinfo" in response.headers:
-                info_parts = response.headers["subscription-userinfo"].split(";")
-                for part in info_parts:
-                    if "=" in part:
-                        k, v = part.strip().split("=")
-                        sub_info[k.lower()] = int(v)
-            raw_data = response.text.strip()
-            raw_data += '=' * ((4 - len(raw_data) % 4) % 4)
-            decoded_text = base64.b64decode(raw_data).decode('utf-8')
-            raw_links = [line.strip() for line in decoded_text.splitlines() if line.strip()]
-            parsed_links = [self.parse_config(link) for link in raw_links]
-
-            real_configs = []
-            inline_name = None
-            inline_data = None
-            inline_expire = None
-
-            for config in parsed_links:
-                remark = config.get("remark", "")
-                server_ip = config.get("details", {}).get("server", "")
-                if "اسم:" in remark:
-                    inline_name = remark.split("اسم:")[-1].strip()
-                    continue
-                if "حجم باقی مانده:" in remark:
-                    raw_val = remark.split("حجم باقی مانده:")[-1].strip()
-                    inline_data = self._format_persian_metrics(raw_val, "data")
-                    continue
-                if "زمان باقی مانده:" in remark:
-                    raw_val = remark.split("زمان باقی مانده:")[-1].strip()
-                    inline_expire = self._format_persian_metrics(raw_val, "time")
-                    continue
-                if server_ip in ["127.0.0.1", "8.8.8.8", "0.0.0.0"]:
-                    continue
-                real_configs.append(config)
-
-            if inline_name: sub_name = inline_name
-            if inline_data or inline_expire:
-                sub_info["data_str"] = inline_data if inline_data else "N/A"
-                sub_info["expire_str"] = inline_expire if inline_expire else "N/A"
+            with requests.get(url, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                sub_name = "Subscription"
+                if "profile-title" in response.headers:
+                    sub_name = unquote(response.headers["profile-title"])
+                elif "Content-Disposition" in response.headers:
+                    disp = response.headers["Content-Disposition"]
+                    if "filename=" in disp:
+                        sub_name = disp.split("filename=")[1].strip('"\'')
+                sub_info = {}
+                if "subscription-userinfo" in response.headers:
+                    info_parts = response.headers["subscription-userinfo"].split(";")
+                    for part in info_parts:
+                        if "=" in part:
+                            k, v = part.strip().split("=")
+                            sub_info[k.lower()] = int(v)
+
+                meta = {}
+                lines = self._iter_lines(self._iter_decoded_text(self._iter_body_chunks(response)))
+                real_configs = []
+                for config in self._iter_real_configs((self.parse_config(link) for link in lines), meta):
+                    real_configs.append(config)
+                    if on_config: on_config(config)
+
+            if meta.get("lines") and not meta.get("links"): raise ValueError("Response does not contain any subscription links")
+            if meta.get("name"): sub_name = meta["name"]
+            if "data_str" in meta or "expire_str" in meta:
+                sub_info["data_str"] = meta.get("data_str", "N/A")
+                sub_info["expire_str"] = meta.get("expire_str", "N/A")
 
             self.subscriptions[url] = {
                 "name": sub_name,
                 "info": sub_info,
                 "configs": real_configs
             }
+            self.index.add_subscription(url, self.subscriptions[url])
             self.save_configs()
         except Exception as e: raise RuntimeError(f"Network error: {e}")
 
     def delete_subscription(self, url: str):
         if url in self.subscriptions:
             del self.subscriptions[url]
+            self.index.remove_subscription(url)
             self.save_configs()
 
-    def generate_xray_config(self, config_data: dict, socks_port: int, output_path: str = None):
+    def delete_config(self, url: str, config: dict):
+        configs = self.subscriptions.get(url, {}).get("configs", [])
+        for i, existing in enumerate(configs):
+            if existing is config:
+                del configs[i]
+                self.index.remove_config(config)
+                self.save_configs()
+                return
+
+    def record_latency(self, config: dict, latency_ms: int, dns_ms: int = None):
+        config["ping"] = latency_ms
+        if dns_ms is not None: config["dns"] = dns_ms
+        self.index.update_latency(config)
+
+    def config_host(self, config_data: dict) -> str:
+        details = config_data.get("details", {})
+        if not isinstance(details, dict): return ""
+        return str(details.get("add", "") if config_data.get("protocol") == "vmess" else details.get("server", "")).strip()
+
+    def resolve_host(self, host: str):
+        # Returns (ip, dns_seconds); dns_seconds is the cost of the lookup that
+        # filled the cache entry, so cached hits still report the real DNS time.
+        # Failures are cached for a shorter TTL so a dead name is looked up once per batch.
+        try:
+            ipaddress.ip_address(host)
+            return host, 0.0
+        except ValueError:
+            pass
+        now = time.time()
+        with self.dns_lock:
+            cached = self.dns_cache.get(host)
+            if cached and cached["expires"] > now:
+                if cached["ip"] is None: raise RuntimeError(f"DNS resolution failed for {host}")
+                return cached["ip"], cached["seconds"]
+        start_time = time.time()
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            addresses = [info[4][0] for info in infos]
+            ip = next((a for a in addresses if ":" not in a), addresses[0] if addresses else None)
+        except (OSError, UnicodeError):
+            ip = None
+        seconds = time.time() - start_time
+        ttl = self.dns_ttl if ip is not None else self.dns_failure_ttl
+        with self.dns_lock:
+            self.dns_cache[host] = {"ip": ip, "seconds": seconds, "expires": time.time() + ttl}
+        if ip is None: raise RuntimeError(f"DNS resolution failed for {host}")
+        return ip, seconds
+
+    def preresolve_hosts(self, configs, max_workers: int = DNS_RESOLVE_WORKERS) -> dict:
+        hosts = {self.config_host(c) for c in configs} - {""}
+        results = {}
+        if not hosts: return results
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(hosts))) as executor:
+            futures_map = {executor.submit(self.resolve_host, host): host for host in hosts}
+            for future in concurrent.futures.as_completed(futures_map):
+                try: results[futures_map[future]] = future.result()
+                except Exception: results[futures_map[future]] = (None, -1.0)
+        return results
+
+    def dns_time_ms(self, config_data: dict) -> int:
+        # -1 means the lookup failed, -2 that no lookup was needed (IP literal host).
+        host = self.config_host(config_data)
+        try: ip, seconds = self.resolve_host(host)
+        except Exception: return -1
+        return -2 if ip == host else int(seconds * 1000)
+
+    def _pin_outbound(self, outbound: dict, details: dict, host: str):
+        ip = self.resolve_host(host)[0]
+        if ip == host: return
+        outbound["settings"]["vnext"][0]["address"] = ip
+        stream = outbound["streamSettings"]
+        ws = stream.get("wsSettings")
+        if ws is not None and not ws["headers"].get("Host"): ws["headers"]["Host"] = host
+        if stream.get("security") == "tls":
+            tls = stream.setdefault("tlsSettings", {"serverName": details.get("sni", "") or details.get("host", "")})
+            if not tls.get("serverName"): tls["serverName"] = host
+        elif stream.get("security") == "reality":
+            if not stream["realitySettings"].get("serverName"): stream["realitySettings"]["serverName"] = host
+
+    def generate_xray_config(self, config_data: dict, socks_port: int, output_path: str = None, pin_ip: bool = None):
         if output_path is None: output_path = self.config_path
+        if pin_ip is None: pin_ip = self.pin_resolved_ips
         protocol = config_data.get("protocol")
         if protocol not in ["vmess", "vless"]: raise NotImplementedError("Protocol not supported.")
         details = config_data.get("details", {})
@@ -169,6 +486,8 @@ class V2RayCoreManager:
             security = details.get("security", "none")
             if security == "tls": outbound["streamSettings"]["tlsSettings"] = {"serverName": details.get("sni", ""), "fingerprint": details.get("fp", "chrome")}
             elif security == "reality": outbound["streamSettings"]["realitySettings"] = {"serverName": details.get("sni", ""), "fingerprint": details.get("fp", "chrome"), "publicKey": details.get("pbk", ""), "shortId": details.get("sid", ""), "spiderX": details.get("spx", "/")}
+        host = self.config_host(config_data)
+        if pin_ip and host: self._pin_outbound(outbound, details, host)
         with open(output_path, 'w', encoding='utf-8') as f: json.dump({"inbounds": inbounds, "outbounds": [outbound]}, f, indent=4)
 
     def start_connection(self, config_data: dict, socks_port: int):
@@ -190,9 +509,22 @@ class V2RayCoreManager:
             self.xray_process.wait()
             self.xray_process = None
 
-    def test_latency(self, config_data: dict, test_port: int, ping_url: str = "http://connectivitycheck.gstatic.com/generate_204") -> float:
+    def test_latency(self, config_data: dict, test_port: int, ping_url: str = "http://connectivitycheck.gstatic.com/generate_204", pin_ip: bool = True, timings: dict = None) -> float:
+        # Latency is measured against the pre-resolved IP by default so DNS time
+        # is not folded into the proxy round trip; the DNS time of the lookup this
+        # run used goes into timings["dns_ms"] (-1 failed, -2 not measured). An
+        # unresolvable host fails the test instead of silently letting Xray resolve it.
+        if timings is None: timings = {}
+        timings["dns_ms"] = -2
         temp_config_path = f"xray_ping_config_{test_port}.json"
-        try: self.generate_xray_config(config_data, test_port, output_path=temp_config_path)
+        host = self.config_host(config_data)
+        if pin_ip and host:
+            try: ip, dns_seconds = self.resolve_host(host)
+            except Exception:
+                timings["dns_ms"] = -1
+                raise RuntimeError("DNS Error")
+            if ip != host: timings["dns_ms"] = int(dns_seconds * 1000)
+        try: self.generate_xray_config(config_data, test_port, output_path=temp_config_path, pin_ip=pin_ip)
         except Exception: raise RuntimeError("Config Error")
         
         binary_name = "xray.exe" if self.is_windows else "xray"
@@ -3,11 +3,14 @@ import sys
 import time
 import concurrent.futures
 from PyQt5.QtWidgets import QApplication, QMessageBox, QListWidgetItem, QWidget, QHBoxLayout, QLabel, QPushButton
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal, Qt
 from PyQt5.QtGui import QColor, QBrush, QFont
 from ui import MainWindow, PingDialog
 from core import V2RayCoreManager
 
+SEARCH_RESULT_LIMIT = 200
+SEARCH_DEBOUNCE_MS = 250
+
 class ConfigItemWidget(QWidget):
     def __init__(self, base_text, index, ping_callback, delete_callback):
         super().__init__()
@@ -31,18 +34,22 @@ class ConfigItemWidget(QWidget):
         self.btn_delete.clicked.connect(lambda: delete_callback(index))
         layout.addWidget(self.btn_delete)
 
-    def update_ping_status(self, latency_ms):
+    def update_ping_status(self, latency_ms, dns_ms=-2):
+        if dns_ms >= 0: dns_text = f" (DNS: {dns_ms} ms)"
+        elif dns_ms == -1: dns_text = " (DNS failed)"
+        else: dns_text = ""
         if latency_ms >= 0:
-            self.lbl_text.setText(f"{self.base_text} | Ping: {latency_ms} ms")
+            self.lbl_text.setText(f"{self.base_text} | Ping: {latency_ms} ms{dns_text}")
             if latency_ms <= 1000: color = "#2e7d32"
             elif latency_ms <= 2000: color = "#d48806"
             else: color = "#e65100"
             self.lbl_text.setStyleSheet(f"color: {color}; font-weight: bold;")
         else:
-            self.lbl_text.setText(f"{self.base_text} | Ping: Timeout")
+            self.lbl_text.setText(f"{self.base_text} | Ping: Timeout{dns_text}")
             self.lbl_text.setStyleSheet("color: #c62828; font-weight: bold;")
 
 class FetchSubThread(QThread):
+    configs_signal = pyqtSignal(list)
     success_signal = pyqtSignal()
     error_signal = pyqtSignal(str)
 
@@ -50,16 +57,28 @@ class FetchSubThread(QThread):
         super().__init__()
         self.core = core_manager
         self.link = link
+        self.batch = []
+        self.last_emit = time.time()
+
+    def on_config(self, config):
+        self.batch.append(config)
+        if len(self.batch) >= 50 or time.time() - self.last_emit >= 0.2: self.flush()
+
+    def flush(self):
+        if self.batch: self.configs_signal.emit(self.batch)
+        self.batch = []
+        self.last_emit = time.time()
 
     def run(self):
         try:
-            self.core.fetch_subscription(self.link)
+            self.core.fetch_subscription(self.link, on_config=self.on_config)
+            self.flush()
             self.success_signal.emit()
         except Exception as e:
             self.error_signal.emit(str(e))
 
 class BatchPingThread(QThread):
-    progress_signal = pyqtSignal(int, int) 
+    progress_signal = pyqtSignal(int, int, int)
     finished_signal = pyqtSignal()
 
     def __init__(self, core_manager, target_configs, target_url):
@@ -69,23 +88,26 @@ class BatchPingThread(QThread):
         self.target_url = target_url
 
     def run(self):
+        self.core.preresolve_hosts([config_data for _, config_data in self.target_configs])
         with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
             futures_map = {}
             for original_index, config_data in self.target_configs:
                 if config_data.get("protocol") not in ["vmess", "vless"]:
-                    self.progress_signal.emit(original_index, -1)
+                    self.progress_signal.emit(original_index, -1, -2)
                     continue
                 test_port = 20000 + original_index
-                future = executor.submit(self.core.test_latency, config_data, test_port, self.target_url)
-                futures_map[future] = original_index
+                timings = {}
+                future = executor.submit(self.core.test_latency, config_data, test_port, self.target_url, timings=timings)
+                futures_map[future] = (original_index, timings)
 
             for future in concurrent.futures.as_completed(futures_map):
-                original_index = futures_map[future]
+                original_index, timings = futures_map[future]
+                dns_ms = timings.get("dns_ms", -2)
                 try:
                     latency_sec = future.result()
-                    self.progress_signal.emit(original_index, int(latency_sec * 1000))
+                    self.progress_signal.emit(original_index, int(latency_sec * 1000), dns_ms)
                 except Exception:
-                    self.progress_signal.emit(original_index, -1)
+                    self.progress_signal.emit(original_index, -1, dns_ms)
         self.finished_signal.emit()
 
 class V2RayController:
@@ -101,11 +123,17 @@ class V2RayController:
         
         self.fetch_thread = None
         self.ping_thread = None
+        self.visible_configs = []
         
         self.window.btn_add_sub.clicked.connect(self.handle_add_sub)
         self.window.btn_update_sub.clicked.connect(self.handle_update_sub)
         self.window.btn_delete_sub.clicked.connect(self.handle_delete_sub)
         self.window.sub_combo.currentIndexChanged.connect(self.refresh_ui_for_sub)
+        self.search_timer = QTimer()
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.refresh_config_list)
+        self.window.search_input.textChanged.connect(self.search_timer.start)
         
         self.window.btn_connect.clicked.connect(self.handle_connect)
         self.window.btn_disconnect.clicked.connect(self.handle_disconnect)
@@ -137,12 +165,12 @@ class V2RayController:
         self.refresh_ui_for_sub()
 
     def refresh_ui_for_sub(self):
-        self.window.config_list.clear()
         current_url = self.window.sub_combo.currentData()
         
         if not current_url or current_url not in self.core.subscriptions:
             self.window.lbl_data_usage.setText("Data: N/A")
             self.window.lbl_expiry.setText("Expires: N/A")
+            self.refresh_config_list()
             return
 
         sub_data = self.core.subscriptions[current_url]
@@ -168,17 +196,39 @@ class V2RayController:
             self.window.lbl_data_usage.setText("Data: Unknown")
             self.window.lbl_expiry.setText("Expires: Unknown")
 
-        for index, config in enumerate(sub_data.get("configs", [])):
+        self.refresh_config_list()
+
+    def refresh_config_list(self):
+        self.window.config_list.clear()
+        query = self.window.search_input.text().strip()
+        current_url = self.window.sub_combo.currentData()
+        if query:
+            self.visible_configs = self.core.index.search(query, limit=SEARCH_RESULT_LIMIT)
+            if len(self.visible_configs) >= SEARCH_RESULT_LIMIT:
+                self.window.lbl_server_list.setText(f"Search results across all subscriptions (first {SEARCH_RESULT_LIMIT} shown, refine the query):")
+            else:
+                self.window.lbl_server_list.setText(f"Search results across all subscriptions ({len(self.visible_configs)}):")
+        elif current_url in self.core.subscriptions:
+            self.visible_configs = [(current_url, c) for c in self.core.subscriptions[current_url].get("configs", [])]
+            self.window.lbl_server_list.setText("Servers in active subscription:")
+        else:
+            self.visible_configs = []
+            self.window.lbl_server_list.setText("Servers in active subscription:")
+
+        for index, (url, config) in enumerate(self.visible_configs):
             base_text = f"[{config['protocol'].upper()}] {config['remark']}"
+            if query: base_text += f"  ·  {self.core.subscriptions[url].get('name', 'Unknown Sub')}"
             item = QListWidgetItem(self.window.config_list)
             widget = ConfigItemWidget(base_text, index, self.handle_single_ping, self.handle_single_delete)
             if "ping" in config:
-                widget.update_ping_status(config["ping"])
+                widget.update_ping_status(config["ping"], config.get("dns", -2))
             item.setSizeHint(widget.sizeHint())
             self.window.config_list.setItemWidget(item, widget)
 
     def execute_fetch(self, link: str):
+        self.fetch_count = 0
         self.fetch_thread = FetchSubThread(self.core, link)
+        self.fetch_thread.configs_signal.connect(self.on_fetch_configs)
         self.fetch_thread.success_signal.connect(self.on_fetch_success)
         self.fetch_thread.error_signal.connect(self.on_fetch_error)
         self.fetch_thread.start()
@@ -197,15 +247,43 @@ class V2RayController:
         self.window.btn_update_sub.setText("...")
         self.execute_fetch(current_url)
 
+    def on_fetch_configs(self, configs):
+        # Streamed rows are a read-only preview; the list becomes actionable
+        # again once the subscription is stored and refresh_combo_box rebuilds it.
+        if self.window.search_input.text().strip():
+            self.update_fetch_count(len(configs))
+            return
+        if self.fetch_count == 0:
+            self.window.config_list.clear()
+            self.window.config_list.setEnabled(False)
+            self.visible_configs = []
+        for config in configs:
+            QListWidgetItem(f"[{config['protocol'].upper()}] {config['remark']}", self.window.config_list)
+        self.update_fetch_count(len(configs))
+
+    def update_fetch_count(self, added):
+        self.fetch_count += added
+        self.window.lbl_server_list.setText(f"Loading servers... ({self.fetch_count} received)")
+        if not self.window.btn_add_sub.isEnabled(): self.window.btn_add_sub.setText(f"Processing... ({self.fetch_count})")
+        if not self.window.btn_update_sub.isEnabled(): self.window.btn_update_sub.setText(f"... ({self.fetch_count})")
+
+    def end_fetch_preview(self):
+        self.window.config_list.setEnabled(self.window.btn_connect.isEnabled())
+
     def on_fetch_success(self):
         self.window.sub_input.clear()
+        self.end_fetch_preview()
         self.refresh_combo_box()
+        fetched_index = self.window.sub_combo.findData(self.fetch_thread.link)
+        if fetched_index >= 0: self.window.sub_combo.setCurrentIndex(fetched_index)
         self.window.btn_add_sub.setEnabled(True)
         self.window.btn_add_sub.setText("+ Add Sub")
         self.window.btn_update_sub.setEnabled(True)
         self.window.btn_update_sub.setText("Update")
 
     def on_fetch_error(self, error_msg):
+        self.end_fetch_preview()
+        self.refresh_config_list()
         self.window.btn_add_sub.setEnabled(True)
         self.window.btn_add_sub.setText("+ Add Sub")
         self.window.btn_update_sub.setEnabled(True)
@@ -219,36 +297,28 @@ class V2RayController:
             self.refresh_combo_box()
 
     def handle_single_delete(self, index):
-        current_url = self.window.sub_combo.currentData()
-        if not current_url or current_url not in self.core.subscriptions: return
-        configs = self.core.subscriptions[current_url].get("configs", [])
-        if 0 <= index < len(configs):
-            del configs[index]
-            self.core.save_configs()
-            self.refresh_ui_for_sub()
+        if 0 <= index < len(self.visible_configs):
+            url, config = self.visible_configs[index]
+            self.core.delete_config(url, config)
+            self.refresh_config_list()
 
     def handle_single_ping(self, index):
-        current_url = self.window.sub_combo.currentData()
-        if not current_url or current_url not in self.core.subscriptions: return
-        configs = self.core.subscriptions[current_url].get("configs", [])
-        if not (0 <= index < len(configs)): return
+        if not (0 <= index < len(self.visible_configs)): return
 
         dialog = PingDialog(self.window)
         if dialog.exec_():
             target_url = dialog.get_target_url()
             self.window.btn_ping_sub.setEnabled(False)
             self.window.sub_combo.setEnabled(False)
-            target_configs = [(index, configs[index])]
+            self.window.search_input.setEnabled(False)
+            target_configs = [(index, self.visible_configs[index][1])]
             self.ping_thread = BatchPingThread(self.core, target_configs, target_url)
             self.ping_thread.progress_signal.connect(self.on_ping_progress)
             self.ping_thread.finished_signal.connect(self.on_ping_finished)
             self.ping_thread.start()
 
     def handle_batch_ping(self):
-        current_url = self.window.sub_combo.currentData()
-        if not current_url or current_url not in self.core.subscriptions: return
-        configs = self.core.subscriptions[current_url].get("configs", [])
-        if not configs: return
+        if not self.visible_configs: return
 
         dialog = PingDialog(self.window)
         if dialog.exec_():
@@ -256,44 +326,45 @@ class V2RayController:
             self.window.btn_ping_sub.setEnabled(False)
             self.window.btn_ping_sub.setText("Working...")
             self.window.sub_combo.setEnabled(False)
-            target_configs = [(i, c) for i, c in enumerate(configs)]
+            self.window.search_input.setEnabled(False)
+            target_configs = [(i, c) for i, (_, c) in enumerate(self.visible_configs)]
             self.ping_thread = BatchPingThread(self.core, target_configs, target_url)
             self.ping_thread.progress_signal.connect(self.on_ping_progress)
             self.ping_thread.finished_signal.connect(self.on_ping_finished)
             self.ping_thread.start()
 
-    def on_ping_progress(self, index, latency_ms):
-        current_url = self.window.sub_combo.currentData()
-        if not current_url: return
-        self.core.subscriptions[current_url]["configs"][index]["ping"] = latency_ms
+    def on_ping_progress(self, index, latency_ms, dns_ms):
+        if not (0 <= index < len(self.visible_configs)): return
+        self.core.record_latency(self.visible_configs[index][1], latency_ms, dns_ms)
         item = self.window.config_list.item(index)
         if not item: return
         widget = self.window.config_list.itemWidget(item)
-        if widget: widget.update_ping_status(latency_ms)
+        if widget: widget.update_ping_status(latency_ms, dns_ms)
 
     def on_ping_finished(self):
-        current_url = self.window.sub_combo.currentData()
-        if current_url and current_url in self.core.subscriptions:
-            configs = self.core.subscriptions[current_url]["configs"]
+        for url in {url for url, _ in self.visible_configs}:
+            if url not in self.core.subscriptions: continue
+            configs = self.core.subscriptions[url]["configs"]
             configs.sort(key=lambda c: c.get("ping", float('inf')) if c.get("ping", -1) != -1 else float('inf'))
-            self.core.save_configs()
-            self.refresh_ui_for_sub()
+        self.core.save_configs()
+        self.refresh_config_list()
         self.window.btn_ping_sub.setEnabled(True)
         self.window.btn_ping_sub.setText("Ping All")
         self.window.sub_combo.setEnabled(True)
+        self.window.search_input.setEnabled(True)
 
     def handle_connect(self):
-        current_url = self.window.sub_combo.currentData()
         selected_index = self.window.config_list.currentRow()
-        if not current_url or selected_index < 0:
+        if not (0 <= selected_index < len(self.visible_configs)):
             QMessageBox.critical(self.window, "Selection Error", "No server selected. Click on a row background to select.")
             return
 
-        config_data = self.core.subscriptions[current_url]["configs"][selected_index]
+        config_data = self.visible_configs[selected_index][1]
         port_str = self.window.port_input.text()
         if not port_str.isdigit(): return
             
         try:
+            self.core.pin_resolved_ips = self.window.chk_pin_dns.isChecked()
             self.core.start_connection(config_data, int(port_str))
             if self.window.chk_system_proxy.isChecked():
                 self.core.set_system_proxy(enable=True, socks_port=int(port_str))
@@ -302,7 +373,9 @@ class V2RayController:
             self.window.btn_disconnect.setEnabled(True)
             self.window.config_list.setEnabled(False)
             self.window.chk_system_proxy.setEnabled(False)
+            self.window.chk_pin_dns.setEnabled(False)
             self.window.sub_combo.setEnabled(False)
+            self.window.search_input.setEnabled(False)
             self.window.btn_delete_sub.setEnabled(False)
             self.window.btn_update_sub.setEnabled(False)
             self.window.btn_ping_sub.setEnabled(False)
@@ -319,7 +392,9 @@ class V2RayController:
         self.window.btn_disconnect.setEnabled(False)
         self.window.config_list.setEnabled(True)
         self.window.chk_system_proxy.setEnabled(True)
+        self.window.chk_pin_dns.setEnabled(True)
         self.window.sub_combo.setEnabled(True)
+        self.window.search_input.setEnabled(True)
         self.window.btn_delete_sub.setEnabled(True)
         self.window.btn_update_sub.setEnabled(True)
         self.window.btn_ping_sub.setEnabled(True)
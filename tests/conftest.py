@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import V2RayCoreManager
+
+
+@pytest.fixture
+def core(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return V2RayCoreManager()
@@ -0,0 +1,75 @@
+import json
+import socket
+
+import pytest
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+
+    def fake_getaddrinfo(host, port, type=0):
+        calls.append(host)
+        if host == "bad.example": raise socket.gaierror("no such host")
+        return [(socket.AF_INET6, type, 0, "", ("2001:db8::1", 0, 0, 0)), (socket.AF_INET, type, 0, "", ("203.0.113.7", 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    return calls
+
+
+def vless(host):
+    return {"protocol": "vless", "remark": host, "details": {"server": host, "port": 443, "id": "u", "security": "tls", "type": "ws"}}
+
+
+def test_unique_hosts_resolved_once_and_cached(core, lookups):
+    configs = [vless("cdn.example"), vless("cdn.example"), vless("other.example"), vless("198.51.100.1")]
+    results = core.preresolve_hosts(configs)
+    assert sorted(lookups) == ["cdn.example", "other.example"]
+    assert results["cdn.example"][0] == "203.0.113.7"
+    assert results["198.51.100.1"] == ("198.51.100.1", 0.0)
+    assert core.dns_time_ms(configs[0]) >= 0
+    assert core.dns_time_ms(configs[3]) == -2
+    assert len(lookups) == 2
+
+
+def test_failures_are_cached_until_failure_ttl(core, lookups):
+    config = vless("bad.example")
+    core.preresolve_hosts([config])
+    assert core.dns_time_ms(config) == -1
+    with pytest.raises(RuntimeError):
+        core.generate_xray_config(config, 10808, output_path="out.json", pin_ip=True)
+    assert lookups == ["bad.example"]
+    core.dns_cache["bad.example"]["expires"] = 0
+    core.dns_time_ms(config)
+    assert lookups == ["bad.example"] * 2
+
+
+def test_latency_test_fails_on_dns_instead_of_falling_back(core, lookups):
+    with pytest.raises(RuntimeError, match="DNS Error"):
+        core.test_latency(vless("bad.example"), 20000)
+
+
+def test_pinning_keeps_sni_and_host(core, lookups, tmp_path):
+    core.generate_xray_config(vless("cdn.example"), 10808, output_path="out.json", pin_ip=True)
+    outbound = json.load(open(tmp_path / "out.json"))["outbounds"][0]
+    assert outbound["settings"]["vnext"][0]["address"] == "203.0.113.7"
+    assert outbound["streamSettings"]["tlsSettings"]["serverName"] == "cdn.example"
+    assert outbound["streamSettings"]["wsSettings"]["headers"]["Host"] == "cdn.example"
+
+
+def test_latency_records_the_dns_time_it_used(core, lookups):
+    core.dns_cache["cdn.example"] = {"ip": "203.0.113.7", "seconds": 0.042, "expires": float("inf")}
+    timings = {}
+    with pytest.raises(RuntimeError, match="DNS Error"):
+        core.test_latency(vless("bad.example"), 20000, timings=timings)
+    assert timings == {"dns_ms": -1}
+    config = vless("cdn.example")
+    config["protocol"] = "trojan"
+    timings = {}
+    with pytest.raises(RuntimeError, match="Config Error"):
+        core.test_latency(config, 20000, timings=timings)
+    assert timings == {"dns_ms": 42}
+    timings = {}
+    with pytest.raises(RuntimeError, match="Config Error"):
+        core.test_latency({"protocol": "trojan", "details": {"server": "198.51.100.1"}}, 20000, timings=timings)
+    assert timings == {"dns_ms": -2}
@@ -0,0 +1,112 @@
+import pytest
+
+from core import ServerIndex
+
+LINKS = [
+    "vless://u@de1.cdn.foo.net:443?security=reality&type=tcp&sni=www.speedtest.net#🇩🇪 آلمان DE-1",
+    "vless://u@de2.example.com:443?security=tls&type=ws&host=edge-front.example.org#🇩🇪 Germany 2",
+    "vless://u@nl.example.com:443?security=reality&type=grpc#🇳🇱 Netherlands",
+]
+
+
+@pytest.fixture
+def index(core):
+    configs = [core.parse_config(link) for link in LINKS]
+    index = ServerIndex()
+    index.add_subscription("sub-a", {"name": "Fast Sub", "configs": configs[:2]})
+    index.add_subscription("sub-b", {"name": "Other", "configs": configs[2:]})
+    return index, configs
+
+
+def remarks(results):
+    return [config["remark"] for _, config in results]
+
+
+def test_words_are_prefix_matched_and_anded(index):
+    index, _ = index
+    assert remarks(index.search("germ")) == ["🇩🇪 Germany 2"]
+    assert remarks(index.search("de sec:reality")) == ["🇩🇪 آلمان DE-1"]
+    assert remarks(index.search("germany netherlands")) == []
+
+
+def test_plain_reality_germany_query(core):
+    index = ServerIndex()
+    links = ["vless://u@a.example:443?security=reality&type=tcp#Germany Fast",
+             "vless://u@b.example:443?security=tls&type=ws#Germany Slow"]
+    index.add_subscription("s", {"name": "Sub", "configs": [core.parse_config(link) for link in links]})
+    assert remarks(index.search("reality germany")) == ["Germany Fast"]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("reality de", ["🇩🇪 آلمان DE-1"]),
+    ("grpc", ["🇳🇱 Netherlands"]),
+    ("tls de", ["🇩🇪 Germany 2"]),
+])
+def test_plain_words_match_protocol_transport_and_security(index, query, expected):
+    index, _ = index
+    assert remarks(index.search(query)) == expected
+    assert len(index.search("vless")) == 3
+
+
+def test_persian_text_and_flags(index):
+    index, _ = index
+    assert remarks(index.search("آلم")) == ["🇩🇪 آلمان DE-1"]
+    assert remarks(index.search("نمان")) == []
+    assert len(index.search("🇩🇪")) == 2
+
+
+@pytest.mark.parametrize("query", ["cdn.foo.net", "foo", "host:de1.cdn", "speedtest", "edge-front"])
+def test_hosts_are_searchable(index, query):
+    index, _ = index
+    assert len(index.search(query)) == 1
+
+
+def test_field_filters(index):
+    index, _ = index
+    assert remarks(index.search("net:grpc")) == ["🇳🇱 Netherlands"]
+    assert remarks(index.search("proto:vless sec:tls")) == ["🇩🇪 Germany 2"]
+    assert len(index.search("sub:fast")) == 2
+    assert index.search("proto:vmess") == []
+
+
+def test_results_carry_subscription_url(index):
+    index, configs = index
+    assert index.search("netherlands") == [("sub-b", configs[2])]
+
+
+def test_latency_sort_puts_timeouts_and_unpinged_last(index):
+    index, configs = index
+    configs[0]["ping"], configs[2]["ping"] = 300, -1
+    index.update_latency(configs[0])
+    index.update_latency(configs[2])
+    assert remarks(index.search("")) == ["🇩🇪 آلمان DE-1", "🇩🇪 Germany 2", "🇳🇱 Netherlands"]
+    configs[1]["ping"] = 120
+    index.update_latency(configs[1])
+    assert remarks(index.search("", limit=2)) == ["🇩🇪 Germany 2", "🇩🇪 آلمان DE-1"]
+
+
+def test_remove_config_and_subscription(index):
+    index, configs = index
+    index.remove_config(configs[0])
+    assert index.search("cdn") == []
+    index.remove_subscription("sub-a")
+    assert remarks(index.search("")) == ["🇳🇱 Netherlands"]
+    index.remove_subscription("sub-b")
+    assert not index.entries and not index.tokens and not index.sub_keys
+
+
+def test_readding_subscription_replaces_entries(index, core):
+    index, _ = index
+    index.add_subscription("sub-a", {"name": "Fast Sub", "configs": [core.parse_config(LINKS[2])]})
+    assert len(index.search("sub:fast")) == 1
+    assert index.search("germany") == []
+
+
+def test_manager_keeps_index_in_sync(core):
+    config = core.parse_config(LINKS[1])
+    core.subscriptions["sub-a"] = {"name": "Fast Sub", "info": {}, "configs": [config]}
+    core.index.add_subscription("sub-a", core.subscriptions["sub-a"])
+    core.record_latency(config, 80)
+    assert core.index.entries[id(config)]["latency"] == 80
+    core.delete_config("sub-a", config)
+    assert core.index.search("germany") == []
@@ -0,0 +1,155 @@
+import base64
+
+import pytest
+
+import core as core_module
+
+LINKS = [
+    "vless://uuid@1.2.3.4:443?security=reality&type=tcp#%F0%9F%87%A9%F0%9F%87%AA%20%D8%A2%D9%84%D9%85%D8%A7%D9%86",
+    "vless://uuid@127.0.0.1:1#اسم: My Sub",
+    "vless://uuid@0.0.0.0:1#حجم باقی مانده: 12.5 گیگابایت",
+    "vless://uuid@0.0.0.0:1#زمان باقی مانده: 3 روز 4 ساعت",
+    "trojan://pass@host.example:443#Trojan",
+]
+BODY = "\n".join(LINKS).encode("utf-8")
+
+
+class FakeResponse:
+    def __init__(self, body, chunk_size, headers=None):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self.body), self.chunk_size):
+            yield self.body[i:i + self.chunk_size]
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def lines_of(core, data, size):
+    return list(core._iter_lines(core._iter_decoded_text(chunked(data, size))))
+
+
+def real_configs(core, data, size):
+    meta = {}
+    configs = list(core._iter_real_configs((core.parse_config(l) for l in lines_of(core, data, size)), meta))
+    return configs, meta
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 16, 4096])
+@pytest.mark.parametrize("encode", [
+    lambda b: b,
+    base64.b64encode,
+    lambda b: base64.b64encode(b).rstrip(b"="),
+    lambda b: base64.urlsafe_b64encode(b).rstrip(b"="),
+    base64.encodebytes,
+])
+def test_all_body_formats_decode_to_same_lines(core, encode, size):
+    assert lines_of(core, encode(BODY), size) == LINKS
+
+
+def test_urlsafe_alphabet_is_translated(core):
+    payload = "vless://u@h:1#" + "ÿþ" * 20
+    encoded = base64.urlsafe_b64encode(payload.encode("utf-8"))
+    assert b"-" in encoded or b"_" in encoded
+    assert lines_of(core, encoded, 5) == [payload]
+
+
+@pytest.mark.parametrize("size", [1, 16, 4096])
+def test_plain_body_with_header_comments(core, size):
+    body = b"#profile-title: base64:TXkgU3Vi\n#profile-update-interval: 12\n\n" + BODY
+    configs, _ = real_configs(core, body, size)
+    assert [c["protocol"] for c in configs] == ["vless", "trojan"]
+
+
+def test_metadata_nodes_are_extracted_not_listed(core):
+    configs, meta = real_configs(core, base64.b64encode(BODY), 16)
+    assert [c["remark"] for c in configs] == ["🇩🇪 آلمان", "Trojan"]
+    assert {k: meta[k] for k in ("name", "data_str", "expire_str")} == {"name": "My Sub", "data_str": "12.5GB", "expire_str": "3d, 4h"}
+
+
+def test_lines_without_a_scheme_are_dropped(core):
+    configs, _ = real_configs(core, b"vless://u@1.2.3.4:443#A\n<p>not a link</p>\nrandom words\n", 8)
+    assert [c["remark"] for c in configs] == ["A"]
+
+
+def test_unsupported_schemes_are_kept_as_unknown(core):
+    body = b"ss://YWVzLTI1Ni1nY206cGFzcw@5.6.7.8:8388#SS\nhysteria2://pw@9.9.9.9:443#HY2\nvless://u@1.2.3.4:443#A\n"
+    configs, _ = real_configs(core, base64.b64encode(body), 16)
+    assert [c["protocol"] for c in configs] == ["unknown", "unknown", "vless"]
+
+
+def test_empty_body(core):
+    assert lines_of(core, b"", 16) == []
+    assert lines_of(core, b"  \r\n ", 16) == []
+
+
+def test_body_cap_from_content_length(core):
+    response = FakeResponse(b"x" * 10, 4, headers={"Content-Length": "11"})
+    with pytest.raises(ValueError):
+        next(core._iter_body_chunks(response, max_bytes=10))
+
+
+def test_body_cap_while_streaming(core):
+    response = FakeResponse(b"x" * 11, 4)
+    chunks = core._iter_body_chunks(response, max_bytes=10)
+    assert next(chunks) == b"xxxx"
+    assert next(chunks) == b"xxxx"
+    with pytest.raises(ValueError):
+        next(chunks)
+
+
+def test_stream_is_lazy(core):
+    def chunks():
+        yield b"vless://u@1.2.3.4:443#First\n"
+        raise AssertionError("body read past the first line")
+
+    assert next(core._iter_lines(core._iter_decoded_text(chunks()))) == "vless://u@1.2.3.4:443#First"
+
+
+class FakeRequests:
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, url, timeout=None, stream=False):
+        return FakeHTTPResponse(self.body)
+
+
+class FakeHTTPResponse(FakeResponse):
+    def __init__(self, body):
+        super().__init__(body, 64)
+
+    def raise_for_status(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.mark.parametrize("body", [
+    b"<html><body><h1>503</h1>Service temporarily unavailable</body></html>",
+    b'{"error": "subscription expired"}',
+])
+def test_non_subscription_body_keeps_existing_subscription(core, monkeypatch, body):
+    monkeypatch.setattr(core_module, "requests", FakeRequests(base64.b64encode(BODY)))
+    core.fetch_subscription("https://sub.example/x")
+    stored = core.subscriptions["https://sub.example/x"]
+    assert len(stored["configs"]) == 2
+
+    monkeypatch.setattr(core_module, "requests", FakeRequests(body))
+    with pytest.raises(RuntimeError):
+        core.fetch_subscription("https://sub.example/x")
+    assert core.subscriptions["https://sub.example/x"] is stored
+    assert len(core.index.search("sub:my")) == 2
+
+
+def test_empty_body_still_stores_empty_subscription(core, monkeypatch):
+    monkeypatch.setattr(core_module, "requests", FakeRequests(b"\n"))
+    core.fetch_subscription("https://sub.example/empty")
+    assert core.subscriptions["https://sub.example/empty"]["configs"] == []
@@ -111,7 +111,12 @@ class MainWindow(QMainWindow):
         
         main_layout.addWidget(card_frame)
 
-        main_layout.addWidget(QLabel("Servers in active subscription:"))
+        self.lbl_server_list = QLabel("Servers in active subscription:")
+        main_layout.addWidget(self.lbl_server_list)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search all subscriptions (e.g., germany sec:reality net:grpc proto:vless host:cdn)...")
+        self.search_input.setClearButtonEnabled(True)
+        main_layout.addWidget(self.search_input)
         self.config_list = QListWidget()
         main_layout.addWidget(self.config_list)
 
@@ -120,9 +125,12 @@ class MainWindow(QMainWindow):
         self.port_input.setPlaceholderText("Port (e.g., 10808)")
         self.port_input.setText("10808") 
         self.chk_system_proxy = QCheckBox("Set as System Proxy (Global)")
+        self.chk_pin_dns = QCheckBox("Pin Resolved IPs")
+        self.chk_pin_dns.setToolTip("Connect to the pre-resolved server IP while keeping SNI/Host unchanged.\nPing tests always use the pre-resolved IP so DNS time is reported separately;\nservers whose name does not resolve are reported as DNS failures.")
         settings_layout.addWidget(QLabel("Base Inbound Port:"))
         settings_layout.addWidget(self.port_input)
         settings_layout.addWidget(self.chk_system_proxy)
+        settings_layout.addWidget(self.chk_pin_dns)
         main_layout.addLayout(settings_layout)
         
         control_layout = QHBoxLayout()